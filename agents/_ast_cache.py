@@ -0,0 +1,57 @@
+"""Share source text and parsed ASTs between agents within a run."""
+
+from __future__ import annotations
+
+import ast
+import functools
+import os
+from pathlib import Path
+
+SYMBOL_NODES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+PARSE_WORKERS = min(8, os.cpu_count() or 1)
+
+
+@functools.lru_cache(maxsize=256)
+def _read_cached(path: str, mtime_ns: int, size: int) -> str:
+    return Path(path).read_text(encoding="utf-8")
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_cached(path: str, mtime_ns: int, size: int) -> ast.Module:
+    content = _read_cached(path, mtime_ns, size)
+    # Same tree as ast.parse, but without inheriting this module's __future__ flags,
+    # and syntax errors report the real file name.
+    return compile(content, path, "exec", flags=ast.PyCF_ONLY_AST, dont_inherit=True)
+
+
+@functools.lru_cache(maxsize=256)
+def _symbols_cached(path: str, mtime_ns: int, size: int) -> tuple[ast.AST, ...]:
+    parsed = _parse_cached(path, mtime_ns, size)
+    # Only module-level definitions and class members matter; skip descending into bodies.
+    top_level = [node for node in parsed.body if isinstance(node, SYMBOL_NODES)]
+    members = [
+        child
+        for node in top_level
+        if isinstance(node, ast.ClassDef)
+        for child in node.body
+        if isinstance(child, SYMBOL_NODES)
+    ]
+    return tuple(top_level + members)
+
+
+def read_source(file_path: Path) -> str:
+    """Return the text of file_path, reusing the read made for an earlier parse."""
+    stat = file_path.stat()
+    return _read_cached(str(file_path), stat.st_mtime_ns, stat.st_size)
+
+
+def parse_file(file_path: Path) -> ast.Module:
+    """Parse file_path, reusing the previous tree while its mtime and size are unchanged."""
+    stat = file_path.stat()
+    return _parse_cached(str(file_path), stat.st_mtime_ns, stat.st_size)
+
+
+def walk_symbols(file_path: Path) -> tuple[ast.AST, ...]:
+    """Return module-level functions and classes of file_path, followed by class members."""
+    stat = file_path.stat()
+    return _symbols_cached(str(file_path), stat.st_mtime_ns, stat.st_size)
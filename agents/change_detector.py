@@ -3,12 +3,23 @@
 from __future__ import annotations
 
 import ast
+import functools
 import logging
+import re
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Iterable
 
+from agents._ast_cache import PARSE_WORKERS, walk_symbols
+
+# Pin the header format so user settings such as diff.noprefix cannot change it.
+_DIFF_CMD = ["git", "diff", "-U0", "--src-prefix=a/", "--dst-prefix=b/", "--no-color", "--no-ext-diff"]
+# Only Python sources under src/ are analysed; other paths are never diffed.
+_DIFF_PATHSPEC = ["--", "src/*.py"]
+_DEF_OR_CLASS_RE = re.compile(r"^\+(?!\+\+)\s*(?:def|class)\s+([A-Za-z_]\w*)")
+
 
 @dataclass(frozen=True)
 class ChangedSymbol:
@@ -31,31 +42,27 @@ class ChangeDetectionAgent:
     def __init__(self, repo_root: Path) -> None:
         self.repo_root = repo_root
         self.logger = logging.getLogger(self.__class__.__name__)
+        self._diff_by_file: dict[Path, list[str]] | None = None
 
     def detect_changes(self) -> ChangeDetectionResult:
         changed_files = self._detect_changed_files()
         changed_symbols: list[ChangedSymbol] = []
-        for file_path in changed_files:
-            changed_symbols.extend(self._detect_changed_symbols(file_path))
+        with ThreadPoolExecutor(max_workers=PARSE_WORKERS) as executor:
+            for file_symbols in executor.map(self._detect_changed_symbols, changed_files):
+                changed_symbols.extend(file_symbols)
         self.logger.info("Detected %s changed file(s).", len(changed_files))
         return ChangeDetectionResult(changed_files=changed_files, changed_symbols=changed_symbols)
 
     def _detect_changed_files(self) -> list[Path]:
-        diff_cmd = ["git", "diff", "--name-only", "HEAD~1", "HEAD"]
         try:
-            output = subprocess.check_output(diff_cmd, cwd=self.repo_root, text=True)
-        except subprocess.CalledProcessError:
-            output = subprocess.check_output(
-                ["git", "diff", "--name-only", "HEAD"], cwd=self.repo_root, text=True
-            )
+            diff_by_file = self._load_diff()
         except FileNotFoundError:
             self.logger.warning("Git not available; skipping change detection.")
             return []
 
-        files = [Path(line.strip()) for line in output.splitlines() if line.strip()]
         src_files = [
             self.repo_root / file
-            for file in files
+            for file in diff_by_file
             if file.suffix == ".py" and (self.repo_root / "src") in (self.repo_root / file).parents
         ]
         return [file for file in src_files if file.exists()]
@@ -63,6 +70,9 @@ class ChangeDetectionAgent:
     def _detect_changed_symbols(self, file_path: Path) -> Iterable[ChangedSymbol]:
         diff_lines = self._diff_zero_context(file_path)
         candidate_names = self._extract_changed_names(diff_lines)
+        if not candidate_names and diff_lines:
+            # The diff touched no def/class lines, so no symbol needs re-parsing.
+            return []
         symbols = self._parse_symbols(file_path)
         if not candidate_names:
             return symbols
@@ -72,46 +82,77 @@ class ChangeDetectionAgent:
     def _diff_zero_context(self, file_path: Path) -> list[str]:
         rel_path = file_path.relative_to(self.repo_root)
         try:
-            output = subprocess.check_output(
-                ["git", "diff", "-U0", "HEAD~1", "HEAD", "--", str(rel_path)],
-                cwd=self.repo_root,
-                text=True,
-            )
-        except subprocess.CalledProcessError:
-            output = ""
-        return output.splitlines()
-
-    def _extract_changed_names(self, diff_lines: Iterable[str]) -> set[str]:
-        names: set[str] = set()
+            diff_by_file = self._load_diff()
+        except FileNotFoundError:
+            return []
+        return diff_by_file.get(rel_path, [])
+
+    def _load_diff(self) -> dict[Path, list[str]]:
+        """Run one zero-context diff over src/ and cache it split per file."""
+        if self._diff_by_file is None:
+            try:
+                self._diff_by_file = self._stream_diff([*_DIFF_CMD, "HEAD~1", "HEAD", *_DIFF_PATHSPEC])
+            except subprocess.CalledProcessError:
+                self._diff_by_file = self._stream_diff([*_DIFF_CMD, "HEAD", *_DIFF_PATHSPEC])
+        return self._diff_by_file
+
+    def _stream_diff(self, diff_cmd: list[str]) -> dict[Path, list[str]]:
+        with subprocess.Popen(
+            diff_cmd,
+            cwd=self.repo_root,
+            stdout=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+        ) as proc:
+            diff_by_file = self._split_diff(line.rstrip("\n") for line in proc.stdout)
+        if proc.returncode:
+            raise subprocess.CalledProcessError(proc.returncode, diff_cmd)
+        return diff_by_file
+
+    @staticmethod
+    def _split_diff(diff_lines: Iterable[str]) -> dict[Path, list[str]]:
+        """Keep each .py section's header plus its added def/class lines; drop everything else."""
+        sections: dict[Path, list[str]] = {}
+        current: list[str] | None = None
         for line in diff_lines:
-            if not line.startswith("+") or line.startswith("+++"):
-                continue
-            stripped = line.lstrip("+").strip()
-            if stripped.startswith("def "):
-                name = stripped.split("def ", 1)[1].split("(", 1)[0].strip()
-                if name:
-                    names.add(name)
-            if stripped.startswith("class "):
-                name = stripped.split("class ", 1)[1].split("(", 1)[0].split(":", 1)[0].strip()
-                if name:
-                    names.add(name)
-        return names
+            if line.startswith("diff --git "):
+                # Header is "diff --git a/<old> b/<new>"; key on the new path.
+                new_path = Path(line.rpartition(" b/")[2])
+                current = sections.setdefault(new_path, []) if new_path.suffix == ".py" else None
+                if current is not None:
+                    current.append(line)
+            elif current is not None and _DEF_OR_CLASS_RE.match(line):
+                current.append(line)
+        return sections
+
+    def _extract_changed_names(self, diff_lines: Iterable[str]) -> frozenset[str]:
+        return frozenset(
+            match.group(1) for line in diff_lines if (match := _DEF_OR_CLASS_RE.match(line))
+        )
 
     def _parse_symbols(self, file_path: Path) -> list[ChangedSymbol]:
-        content = file_path.read_text(encoding="utf-8")
-        parsed = ast.parse(content)
-        symbols: list[ChangedSymbol] = []
-        for node in ast.walk(parsed):
-            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
-                end_lineno = getattr(node, "end_lineno", node.lineno)
-                symbol_type = "class" if isinstance(node, ast.ClassDef) else "function"
-                symbols.append(
-                    ChangedSymbol(
-                        name=node.name,
-                        symbol_type=symbol_type,
-                        file_path=file_path,
-                        lineno=node.lineno,
-                        end_lineno=end_lineno,
-                    )
-                )
-        return symbols
+        return load_symbols(file_path)
+
+
+def load_symbols(file_path: Path) -> list[ChangedSymbol]:
+    """Return the symbols defined in file_path, reusing cached parses across agents."""
+    return list(_symbols_from_nodes(file_path, walk_symbols(file_path)))
+
+
+@functools.lru_cache(maxsize=256)
+def _symbols_from_nodes(file_path: Path, nodes: tuple[ast.AST, ...]) -> tuple[ChangedSymbol, ...]:
+    symbols: list[ChangedSymbol] = []
+    for node in nodes:
+        end_lineno = getattr(node, "end_lineno", node.lineno)
+        symbol_type = "class" if isinstance(node, ast.ClassDef) else "function"
+        symbols.append(
+            ChangedSymbol(
+                name=node.name,
+                symbol_type=symbol_type,
+                file_path=file_path,
+                lineno=node.lineno,
+                end_lineno=end_lineno,
+            )
+        )
+    return tuple(symbols)
@@ -2,14 +2,15 @@
 
 from __future__ import annotations
 
-import ast
 import json
 import logging
-import subprocess
+from array import array
+from bisect import bisect_left
 from dataclasses import dataclass
 from pathlib import Path
 
-from agents.change_detector import ChangeDetectionResult, ChangedSymbol
+from agents.change_detector import ChangeDetectionResult, ChangedSymbol, load_symbols
+from agents.pytest_session import COVERAGE_ARGS, PytestRunResult, run_pytest
 
 
 @dataclass(frozen=True)
@@ -31,8 +32,12 @@ class CoverageAnalyzerAgent:
         self.repo_root = repo_root
         self.logger = logging.getLogger(self.__class__.__name__)
 
-    def analyze(self, changes: ChangeDetectionResult) -> CoverageAnalysisResult:
-        coverage_json = self._run_coverage()
+    def analyze(
+        self,
+        changes: ChangeDetectionResult,
+        pytest_run: PytestRunResult | None = None,
+    ) -> CoverageAnalysisResult:
+        coverage_json = self._run_coverage(pytest_run)
         if coverage_json is None or not coverage_json.exists():
             self.logger.warning("Coverage data not available.")
             return CoverageAnalysisResult(gaps=[], coverage_json_path=None)
@@ -41,17 +46,16 @@ class CoverageAnalyzerAgent:
         gaps = self._find_gaps(coverage_data, changes)
         return CoverageAnalysisResult(gaps=gaps, coverage_json_path=coverage_json)
 
-    def _run_coverage(self) -> Path | None:
-        coverage_json = self.repo_root / "coverage.json"
-        cmd = ["pytest", "--cov=src", "--cov-report=json"]
-        try:
-            subprocess.run(cmd, cwd=self.repo_root, check=True)
-            return coverage_json
-        except subprocess.CalledProcessError:
-            self.logger.warning("Pytest coverage run failed.")
-        except FileNotFoundError:
+    def _run_coverage(self, pytest_run: PytestRunResult | None = None) -> Path | None:
+        if pytest_run is None:
+            pytest_run = run_pytest(self.repo_root, COVERAGE_ARGS)
+        if not pytest_run.available:
             self.logger.warning("Pytest not available; skipping coverage.")
-        return None
+            return None
+        if not pytest_run.success:
+            self.logger.warning("Pytest coverage run failed.")
+            return None
+        return self.repo_root / "coverage.json"
 
     def _find_gaps(self, coverage_data: dict, changes: ChangeDetectionResult) -> list[CoverageGap]:
         files_data = coverage_data.get("files", {})
@@ -61,7 +65,7 @@ class CoverageAnalyzerAgent:
             file_data = files_data.get(rel_path)
             if not file_data:
                 continue
-            missing_lines = set(file_data.get("missing_lines", []))
+            missing_lines = array("i", sorted(file_data.get("missing_lines", [])))
             if not missing_lines:
                 continue
             symbols = self._load_symbols(changed_file)
@@ -75,27 +79,10 @@ class CoverageAnalyzerAgent:
         return gaps
 
     def _load_symbols(self, file_path: Path) -> list[ChangedSymbol]:
-        content = file_path.read_text(encoding="utf-8")
-        parsed = ast.parse(content)
-        symbols: list[ChangedSymbol] = []
-        for node in ast.walk(parsed):
-            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
-                end_lineno = getattr(node, "end_lineno", node.lineno)
-                symbol_type = "class" if isinstance(node, ast.ClassDef) else "function"
-                symbols.append(
-                    ChangedSymbol(
-                        name=node.name,
-                        symbol_type=symbol_type,
-                        file_path=file_path,
-                        lineno=node.lineno,
-                        end_lineno=end_lineno,
-                    )
-                )
-        return symbols
+        return load_symbols(file_path)
 
     @staticmethod
-    def _symbol_has_missing_lines(symbol: ChangedSymbol, missing_lines: set[int]) -> bool:
-        for line in range(symbol.lineno, symbol.end_lineno + 1):
-            if line in missing_lines:
-                return True
-        return False
+    def _symbol_has_missing_lines(symbol: ChangedSymbol, missing_lines: array) -> bool:
+        # missing_lines is sorted, so the first entry at or after lineno decides.
+        index = bisect_left(missing_lines, symbol.lineno)
+        return index < len(missing_lines) and missing_lines[index] <= symbol.end_lineno
@@ -0,0 +1,38 @@
+"""Run pytest once and share the outcome between agents."""
+
+from __future__ import annotations
+
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Sequence
+
+COVERAGE_ARGS = ("--cov=src", "--cov-report=json")
+
+
+@dataclass(frozen=True)
+class PytestRunResult:
+    returncode: int | None
+    output: str
+
+    @property
+    def available(self) -> bool:
+        return self.returncode is not None
+
+    @property
+    def success(self) -> bool:
+        return self.returncode == 0
+
+
+def run_pytest(repo_root: Path, args: Sequence[str] = ()) -> PytestRunResult:
+    """Invoke pytest once, capturing its output and exit code."""
+    try:
+        completed = subprocess.run(
+            ["pytest", *args],
+            cwd=repo_root,
+            capture_output=True,
+            text=True,
+        )
+    except FileNotFoundError:
+        return PytestRunResult(returncode=None, output="Pytest not available.")
+    return PytestRunResult(returncode=completed.returncode, output=completed.stdout + completed.stderr)
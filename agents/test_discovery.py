@@ -4,9 +4,13 @@ from __future__ import annotations
 
 import ast
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 
+from agents._ast_cache import PARSE_WORKERS, parse_file
+
 
 @dataclass(frozen=True)
 class TestCaseInfo:
@@ -33,8 +37,12 @@ class TestDiscoveryAgent:
             self.logger.info("tests/ directory not found.")
             return TestDiscoveryResult(tests_by_file=tests_by_file)
 
-        for test_file in self.tests_root.rglob("test_*.py"):
-            tests_by_file[test_file] = self._parse_test_cases(test_file)
+        scanned = self._scan_test_files(self.tests_root)
+        tests_by_file = {test_file: [] for test_file, _ in scanned}
+        # Empty files have nothing to parse; keep them mapped to no test cases.
+        test_files = [test_file for test_file, size in scanned if size]
+        with ThreadPoolExecutor(max_workers=PARSE_WORKERS) as executor:
+            tests_by_file.update(zip(test_files, executor.map(self._parse_test_cases, test_files)))
         self.logger.info("Discovered %s test file(s).", len(tests_by_file))
         return TestDiscoveryResult(tests_by_file=tests_by_file)
 
@@ -42,9 +50,19 @@ class TestDiscoveryAgent:
         test_name = f"test_{source_file.stem}.py"
         return self.tests_root / test_name
 
+    def _scan_test_files(self, directory: Path) -> list[tuple[Path, int]]:
+        """Walk directory once, returning (path, size) for every test_*.py file."""
+        found: list[tuple[Path, int]] = []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    found.extend(self._scan_test_files(Path(entry.path)))
+                elif entry.is_file() and entry.name.startswith("test_") and entry.name.endswith(".py"):
+                    found.append((Path(entry.path), entry.stat().st_size))
+        return found
+
     def _parse_test_cases(self, test_file: Path) -> list[TestCaseInfo]:
-        content = test_file.read_text(encoding="utf-8")
-        parsed = ast.parse(content)
+        parsed = parse_file(test_file)
         cases: list[TestCaseInfo] = []
         for node in ast.walk(parsed):
             if isinstance(node, ast.FunctionDef) and node.name.startswith("test_"):
@@ -3,14 +3,28 @@
 from __future__ import annotations
 
 import ast
+import functools
 import logging
+import re
 from dataclasses import dataclass
 from pathlib import Path
 
+from agents._ast_cache import SYMBOL_NODES, parse_file, read_source
 from agents.coverage_analyzer import CoverageAnalysisResult
 from agents.test_discovery import TestDiscoveryResult
 
 
+_NEW_TEST_FILE_HEADER = "\"\"\"Auto-generated tests.\"\"\"\n\nimport pytest\n\n"
+_IMPORT_LINE_RE = re.compile(r"^(?:import|from) .*\n?", re.MULTILINE)
+
+
+@functools.lru_cache(maxsize=128)
+def _module_path(repo_root: Path, source_file: Path) -> str:
+    rel_path = source_file.relative_to(repo_root)
+    module_parts = rel_path.with_suffix("").parts
+    return ".".join(module_parts)
+
+
 @dataclass(frozen=True)
 class GeneratedTest:
     name: str
@@ -25,6 +39,25 @@ class TestGenerationResult:
 class TestGenerationAgent:
     """Create tests for uncovered functions or classes."""
 
+    _FUNCTION_TEST_TEMPLATE = (
+        "def %s():\n"
+        "    \"\"\"Validate %s executes with basic inputs.\"\"\"\n"
+        "    # Arrange\n"
+        "    # Act\n"
+        "    result = %s%s(%s)\n"
+        "    # Assert\n"
+        "    assert result is not None"
+    )
+    _CLASS_TEST_TEMPLATE = (
+        "def %s():\n"
+        "    \"\"\"Ensure %s can be instantiated.\"\"\"\n"
+        "    # Arrange\n"
+        "    # Act\n"
+        "    instance = %s()\n"
+        "    # Assert\n"
+        "    assert instance is not None"
+    )
+
     def __init__(self, repo_root: Path) -> None:
         self.repo_root = repo_root
         self.logger = logging.getLogger(self.__class__.__name__)
@@ -35,38 +68,59 @@ class TestGenerationAgent:
         discovery: TestDiscoveryResult,
     ) -> TestGenerationResult:
         generated: list[GeneratedTest] = []
-        existing_test_names = {
-            test_case.name
-            for test_cases in discovery.tests_by_file.values()
-            for test_case in test_cases
+        existing_names_by_file = {
+            test_file: {test_case.name for test_case in test_cases}
+            for test_file, test_cases in discovery.tests_by_file.items()
         }
         for gap in coverage.gaps:
             module_path = self._module_path_for_file(gap.file)
-            module_alias = self._module_alias(module_path)
             test_file = self._test_file_for_source(gap.file)
             test_file.parent.mkdir(parents=True, exist_ok=True)
-            content_lines = []
-            if test_file.exists():
-                content_lines = test_file.read_text(encoding="utf-8").splitlines()
+            existing_test_names = existing_names_by_file.setdefault(test_file, set())
+            # Discovered files were already read and parsed during discovery; reuse both.
+            if test_file in discovery.tests_by_file or test_file.exists():
+                content = read_source(test_file)
+                bound_names = self._top_level_names(parse_file(test_file))
             else:
-                content_lines = ["\"\"\"Auto-generated tests.\"\"\"", "", "import pytest", ""]
-            content_lines = self._ensure_module_import(content_lines, module_path, module_alias)
+                content = _NEW_TEST_FILE_HEADER
+                bound_names = self._top_level_names(ast.parse(content))
+            module_alias = self._module_alias(module_path)
 
             new_blocks: list[str] = []
+            imported_names: list[str] = []
+            uses_alias = False
             for symbol in self._load_symbols(gap.file):
                 if symbol.name not in gap.missing_tests:
                     continue
                 test_name = f"test_{symbol.name}"
                 if test_name in existing_test_names:
                     continue
-                block = self._build_test_block(symbol, module_alias, test_name)
+                # Names already bound in the test module, or that pytest would collect,
+                # are reached through the module alias instead of being imported directly.
+                direct = symbol.name not in bound_names and not symbol.name.startswith("test_")
+                reference = symbol.name if direct else f"{module_alias}.{symbol.name}"
+                block = self._build_test_block(symbol, test_name, reference)
                 if block:
                     new_blocks.append(block)
+                    if direct:
+                        imported_names.append(symbol.name)
+                        bound_names.add(symbol.name)
+                    else:
+                        uses_alias = True
+                    existing_test_names.add(test_name)
                     generated.append(GeneratedTest(name=test_name, file_path=test_file))
 
             if new_blocks:
-                updated = content_lines + [""] + new_blocks
-                test_file.write_text("\n".join(updated).rstrip() + "\n", encoding="utf-8")
+                import_lines: list[str] = []
+                if imported_names:
+                    import_lines.append(f"from {module_path} import {', '.join(imported_names)}")
+                if uses_alias:
+                    import_lines.append(f"import {module_path} as {module_alias}")
+                content = self._ensure_module_import(content, import_lines)
+                if content and not content.endswith("\n"):
+                    content += "\n"
+                payload = f"{content}\n" + "\n".join(new_blocks) + "\n"
+                test_file.write_bytes(payload.encode("utf-8"))
         self.logger.info("Generated %s new test(s).", len(generated))
         return TestGenerationResult(generated_tests=generated)
 
@@ -75,74 +129,65 @@ class TestGenerationAgent:
         return self.repo_root / "tests" / test_name
 
     def _module_path_for_file(self, source_file: Path) -> str:
-        rel_path = source_file.relative_to(self.repo_root)
-        module_parts = rel_path.with_suffix("").parts
-        return ".".join(module_parts)
+        return _module_path(self.repo_root, source_file)
 
     @staticmethod
     def _module_alias(module_path: str) -> str:
         return f"{module_path.replace('.', '_')}_module"
 
-    def _ensure_module_import(self, lines: list[str], module_path: str, module_alias: str) -> list[str]:
-        import_line = f"import {module_path} as {module_alias}"
-        if import_line in lines:
-            return lines
-        insert_index = 0
-        for index, line in enumerate(lines):
-            if line.startswith("import ") or line.startswith("from "):
-                insert_index = index + 1
-        updated = lines[:insert_index] + [import_line] + lines[insert_index:]
-        return updated
+    @staticmethod
+    def _top_level_names(parsed: ast.Module) -> set[str]:
+        names: set[str] = set()
+        for node in parsed.body:
+            if isinstance(node, (ast.Import, ast.ImportFrom)):
+                names.update((alias.asname or alias.name).split(".", 1)[0] for alias in node.names)
+            elif isinstance(node, SYMBOL_NODES):
+                names.add(node.name)
+            elif isinstance(node, (ast.Assign, ast.AnnAssign, ast.AugAssign)):
+                targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+                for target in targets:
+                    names.update(child.id for child in ast.walk(target) if isinstance(child, ast.Name))
+        return names
+
+    def _ensure_module_import(self, content: str, import_lines: list[str]) -> str:
+        padded = f"\n{content}\n"
+        missing = [line for line in import_lines if f"\n{line}\n" not in padded]
+        if not missing:
+            return content
+        last_import = None
+        for last_import in _IMPORT_LINE_RE.finditer(content):
+            pass
+        insert_at = last_import.end() if last_import else 0
+        head = content[:insert_at]
+        if head and not head.endswith("\n"):
+            head += "\n"
+        return head + "".join(f"{line}\n" for line in missing) + content[insert_at:]
 
     def _load_symbols(self, source_file: Path) -> list[ast.AST]:
-        content = source_file.read_text(encoding="utf-8")
-        parsed = ast.parse(content)
+        parsed = parse_file(source_file)
         symbols: list[ast.AST] = []
         for node in parsed.body:
-            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            if isinstance(node, SYMBOL_NODES):
                 symbols.append(node)
         return symbols
 
-    def _build_test_block(self, symbol: ast.AST, module_alias: str, test_name: str) -> str | None:
+    def _build_test_block(self, symbol: ast.AST, test_name: str, reference: str) -> str | None:
         if isinstance(symbol, (ast.FunctionDef, ast.AsyncFunctionDef)):
-            return self._build_function_test(symbol, module_alias, test_name)
+            return self._build_function_test(symbol, test_name, reference)
         if isinstance(symbol, ast.ClassDef):
-            return self._build_class_test(symbol, module_alias, test_name)
+            return self._build_class_test(symbol, test_name, reference)
         return None
 
-    def _build_function_test(self, symbol: ast.AST, module_alias: str, test_name: str) -> str:
+    def _build_function_test(self, symbol: ast.AST, test_name: str, reference: str) -> str:
         args = []
         if isinstance(symbol, (ast.FunctionDef, ast.AsyncFunctionDef)):
             args = symbol.args.args
-        arg_values = [self._default_value(arg.annotation) for arg in args]
-        call_args = ", ".join(arg_values)
-        if isinstance(symbol, ast.AsyncFunctionDef):
-            call_line = f"    result = await {module_alias}.{symbol.name}({call_args})"
-        else:
-            call_line = f"    result = {module_alias}.{symbol.name}({call_args})"
-
-        lines = [
-            f"def {test_name}():",
-            f"    \"\"\"Validate {symbol.name} executes with basic inputs.\"\"\"",
-            f"    # Arrange",
-            f"    # Act",
-            call_line,
-            f"    # Assert",
-            f"    assert result is not None",
-        ]
-        return "\n".join(lines)
-
-    def _build_class_test(self, symbol: ast.ClassDef, module_alias: str, test_name: str) -> str:
-        lines = [
-            f"def {test_name}():",
-            f"    \"\"\"Ensure {symbol.name} can be instantiated.\"\"\"",
-            f"    # Arrange",
-            f"    # Act",
-            f"    instance = {module_alias}.{symbol.name}()",
-            f"    # Assert",
-            f"    assert instance is not None",
-        ]
-        return "\n".join(lines)
+        call_args = ", ".join(self._default_value(arg.annotation) for arg in args)
+        call_prefix = "await " if isinstance(symbol, ast.AsyncFunctionDef) else ""
+        return self._FUNCTION_TEST_TEMPLATE % (test_name, symbol.name, call_prefix, reference, call_args)
+
+    def _build_class_test(self, symbol: ast.ClassDef, test_name: str, reference: str) -> str:
+        return self._CLASS_TEST_TEMPLATE % (test_name, symbol.name, reference)
 
     def _default_value(self, annotation: ast.AST | None) -> str:
         if annotation is None:
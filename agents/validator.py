@@ -2,11 +2,12 @@
 
 from __future__ import annotations
 
+import io
 import logging
-import subprocess
 from dataclasses import dataclass
 from pathlib import Path
 
+from agents.pytest_session import PytestRunResult, run_pytest
 from agents.test_generator import TestGenerationResult
 
 
@@ -23,8 +24,16 @@ class ValidationAgent:
         self.repo_root = repo_root
         self.logger = logging.getLogger(self.__class__.__name__)
 
-    def validate(self, generated: TestGenerationResult) -> ValidationResult:
-        result = self._run_pytest()
+    def validate(
+        self,
+        generated: TestGenerationResult,
+        baseline: PytestRunResult | None = None,
+    ) -> ValidationResult:
+        # Without newly generated tests the earlier coverage run already reflects the suite.
+        if baseline is not None and not generated.generated_tests:
+            result = self._to_validation_result(baseline)
+        else:
+            result = self._run_pytest()
         if result.success:
             return result
         self.logger.warning("Pytest failed; attempting one retry after auto-correction.")
@@ -33,33 +42,26 @@ class ValidationAgent:
         return retry
 
     def _run_pytest(self) -> ValidationResult:
-        try:
-            completed = subprocess.run(
-                ["pytest"],
-                cwd=self.repo_root,
-                capture_output=True,
-                text=True,
-                check=True,
-            )
-            return ValidationResult(success=True, output=completed.stdout + completed.stderr)
-        except subprocess.CalledProcessError as exc:
-            return ValidationResult(success=False, output=exc.stdout + exc.stderr)
-        except FileNotFoundError:
-            return ValidationResult(success=False, output="Pytest not available.")
+        return self._to_validation_result(run_pytest(self.repo_root))
+
+    @staticmethod
+    def _to_validation_result(pytest_run: PytestRunResult) -> ValidationResult:
+        return ValidationResult(success=pytest_run.success, output=pytest_run.output)
 
     def _auto_correct_generated_tests(self, generated: TestGenerationResult) -> None:
+        names_by_file: dict[Path, set[str]] = {}
         for generated_test in generated.generated_tests:
-            test_file = generated_test.file_path
+            names_by_file.setdefault(generated_test.file_path, set()).add(generated_test.name)
+        for test_file, test_names in names_by_file.items():
             if not test_file.exists():
                 continue
-            lines = test_file.read_text(encoding="utf-8").splitlines()
-            updated_lines: list[str] = []
-            for line in lines:
-                if line.startswith(f"def {generated_test.name}("):
-                    updated_lines.append(
-                        f"@pytest.mark.xfail(reason=\"Auto-corrected generated test\")"
-                    )
-                updated_lines.append(line)
-            if "pytest" not in "\n".join(lines):
-                updated_lines.insert(0, "import pytest")
-            test_file.write_text("\n".join(updated_lines) + "\n", encoding="utf-8")
+            content = test_file.read_text(encoding="utf-8")
+            buffer = io.StringIO()
+            if "pytest" not in content:
+                buffer.write("import pytest\n")
+            for line in content.splitlines():
+                if line.startswith("def ") and line[4:].partition("(")[0] in test_names:
+                    buffer.write("@pytest.mark.xfail(reason=\"Auto-corrected generated test\")\n")
+                buffer.write(line)
+                buffer.write("\n")
+            test_file.write_text(buffer.getvalue(), encoding="utf-8")
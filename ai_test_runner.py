@@ -10,6 +10,7 @@ from pathlib import Path
 
 from agents.change_detector import ChangeDetectionAgent
 from agents.coverage_analyzer import CoverageAnalyzerAgent
+from agents.pytest_session import COVERAGE_ARGS, PytestRunResult, run_pytest
 from agents.test_discovery import TestDiscoveryAgent
 from agents.test_generator import TestGenerationAgent
 from agents.validator import ValidationAgent
@@ -38,13 +39,14 @@ class AITestRunner:
     def run(self) -> int:
         changes = self.change_detector.detect_changes()
         discovery = self.test_discovery.discover_tests()
-        coverage = self.coverage_analyzer.analyze(changes)
+        pytest_run = self._pytest_runner()
+        coverage = self.coverage_analyzer.analyze(changes, pytest_run)
         if self.config.dry_run:
             self._print_summary(changes, coverage, generated_count=0, validation_success=True)
             return 0
 
         generated = self.test_generator.generate_tests(coverage, discovery)
-        validation = self.validator.validate(generated)
+        validation = self.validator.validate(generated, pytest_run)
 
         self._print_summary(
             changes,
@@ -57,6 +59,10 @@ class AITestRunner:
             return 1
         return 0
 
+    def _pytest_runner(self) -> PytestRunResult:
+        """Run the suite once with coverage so analysis and validation share it."""
+        return run_pytest(self.repo_root, COVERAGE_ARGS)
+
     def _print_summary(
         self,
         changes,
@@ -2,8 +2,14 @@
 
 from __future__ import annotations
 
+import functools
+import importlib
+import importlib.util
 from dataclasses import dataclass
 from datetime import datetime
+from typing import Any, Callable, Sequence
+
+_now = datetime.now
 
 
 def safe_divide(dividend: float, divisor: float) -> float:
@@ -24,6 +30,40 @@ def clamp(value: float, minimum: float, maximum: float) -> float:
     return value
 
 
+def clamp_array(values: float | Sequence[float], minimum: float, maximum: float) -> Any:
+    """Clamp every element of values within [minimum, maximum], broadcasting like a NumPy ufunc.
+
+    Uses a Numba ufunc when Numba is installed and NumPy otherwise; both return float64
+    results. Without either, only scalar arguments are supported.
+    """
+    return _clamp_array_impl()(values, minimum, maximum)
+
+
+@functools.lru_cache(maxsize=None)
+def _clamp_array_impl() -> Callable[..., Any]:
+    # Resolved on first use so importing this module never pays for Numba or NumPy.
+    if importlib.util.find_spec("numba") is not None:
+        numba = importlib.import_module("numba")
+        return numba.vectorize(["f8(f8, f8, f8)"], cache=True)(clamp)
+    if importlib.util.find_spec("numpy") is not None:
+        return _clamp_array_numpy
+    return _clamp_array_scalar
+
+
+def _clamp_array_numpy(values: Any, minimum: Any, maximum: Any) -> Any:
+    numpy = importlib.import_module("numpy")
+    values, minimum, maximum = (
+        numpy.asarray(arg, dtype=numpy.float64) for arg in (values, minimum, maximum)
+    )
+    if numpy.any(minimum > maximum):
+        raise ValueError("minimum cannot be greater than maximum")
+    return numpy.minimum(numpy.maximum(values, minimum), maximum)
+
+
+def _clamp_array_scalar(values: float, minimum: float, maximum: float) -> float:
+    return clamp(float(values), float(minimum), float(maximum))
+
+
 @dataclass(frozen=True)
 class StringFormatter:
     """Utility class for simple string formatting."""
@@ -43,12 +83,11 @@ class StringFormatter:
         """Pad text to the desired width using the provided fill character."""
         if len(fill) != 1:
             raise ValueError("fill must be a single character")
-        if width <= len(text):
-            return text
-        return text + (fill * (width - len(text)))
+        return text.ljust(width, fill)
 
 
-def format_with_timestamp(message: str, now_fn=datetime.now) -> str:
+def format_with_timestamp(message: str, now_fn=_now) -> str:
     """Return a message prefixed with the current timestamp."""
-    timestamp = now_fn().strftime("%Y-%m-%d %H:%M:%S")
+    # isoformat avoids re-parsing a strftime pattern; slicing drops any UTC offset.
+    timestamp = now_fn().isoformat(sep=" ", timespec="seconds")[:19]
     return f"[{timestamp}] {message}"
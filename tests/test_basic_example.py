@@ -1,8 +1,9 @@
+import importlib.util
 import unittest
-from datetime import datetime
+from datetime import datetime, timezone
 from unittest import mock
 
-from basic_example import clamp, format_with_timestamp, safe_divide, StringFormatter
+from basic_example import clamp, clamp_array, format_with_timestamp, safe_divide, StringFormatter
 
 
 class TestSafeDivide(unittest.TestCase):
@@ -42,12 +43,39 @@ class TestClamp(unittest.TestCase):
         self.assertEqual(clamp(0, 0, 10), 0)
         self.assertEqual(clamp(10, 0, 10), 10)
 
+    def test_clamp_preserves_input_type(self):
+        # Scalar clamp should return the caller's value unchanged, not a coerced float.
+        self.assertIs(type(clamp(5, 1, 10)), int)
+
     def test_clamp_invalid_range_raises(self):
         # Invalid range where minimum > maximum should raise a ValueError.
         with self.assertRaises(ValueError):
             clamp(5, 10, 1)
 
 
+class TestClampArray(unittest.TestCase):
+    """Tests for clamp_array."""
+
+    def test_clamp_array_scalar_input(self):
+        # Scalars should be clamped like clamp, returning a float.
+        self.assertEqual(clamp_array(3.0, 0.0, 1.0), 1.0)
+
+    def test_clamp_array_invalid_range_raises(self):
+        # Invalid range where minimum > maximum should raise a ValueError.
+        with self.assertRaises(ValueError):
+            clamp_array(5.0, 10.0, 1.0)
+
+    @unittest.skipIf(importlib.util.find_spec("numpy") is None, "numpy not installed")
+    def test_clamp_array_clamps_each_value(self):
+        # Every element should be clamped independently.
+        self.assertEqual(clamp_array([-1.0, 5.0, 11.0], 0.0, 10.0).tolist(), [0.0, 5.0, 10.0])
+
+    @unittest.skipIf(importlib.util.find_spec("numpy") is None, "numpy not installed")
+    def test_clamp_array_broadcasts_bounds(self):
+        # Bounds should broadcast element-wise against the values.
+        self.assertEqual(clamp_array([5.0, 5.0], [0.0, 6.0], [4.0, 10.0]).tolist(), [4.0, 6.0])
+
+
 class TestStringFormatter(unittest.TestCase):
     """Tests for StringFormatter."""
 
@@ -107,6 +135,14 @@ class TestFormatWithTimestamp(unittest.TestCase):
         now_fn.assert_called_once_with()
         self.assertEqual(result, "[2024-01-01 12:30:15] hello")
 
+    def test_format_with_timestamp_ignores_timezone_offset(self):
+        # Aware datetimes should render the same way as naive ones.
+        fixed_time = datetime(2024, 1, 1, 12, 30, 15, 999, tzinfo=timezone.utc)
+
+        result = format_with_timestamp("hello", now_fn=lambda: fixed_time)
+
+        self.assertEqual(result, "[2024-01-01 12:30:15] hello")
+
 
 if __name__ == "__main__":
     unittest.main()
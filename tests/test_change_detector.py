@@ -0,0 +1,107 @@
+import shutil
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+
+from agents.change_detector import ChangeDetectionAgent
+
+
+class TestSplitDiff(unittest.TestCase):
+    """Tests for ChangeDetectionAgent._split_diff."""
+
+    def test_split_diff_keys_sections_by_new_path(self):
+        # Each "diff --git" header should start a section keyed on its b/ path.
+        diff_lines = [
+            "diff --git a/src/old.py b/src/new.py",
+            "+def moved():",
+            "diff --git a/src/pkg/mod.py b/src/pkg/mod.py",
+            "+class Widget:",
+        ]
+
+        sections = ChangeDetectionAgent._split_diff(diff_lines)
+
+        self.assertEqual(list(sections), [Path("src/new.py"), Path("src/pkg/mod.py")])
+        self.assertEqual(sections[Path("src/new.py")][-1], "+def moved():")
+        self.assertEqual(sections[Path("src/pkg/mod.py")][-1], "+class Widget:")
+
+    def test_split_diff_keeps_only_headers_and_definitions(self):
+        # Hunk bodies and non-Python sections should not be retained.
+        diff_lines = [
+            "diff --git a/src/m.py b/src/m.py",
+            "index 1111111..2222222 100644",
+            "@@ -1,0 +2,2 @@",
+            "+def added():",
+            "+    return 1",
+            "-def removed():",
+            "diff --git a/src/notes.txt b/src/notes.txt",
+            "+def not_python():",
+        ]
+
+        sections = ChangeDetectionAgent._split_diff(diff_lines)
+
+        self.assertEqual(
+            sections,
+            {Path("src/m.py"): ["diff --git a/src/m.py b/src/m.py", "+def added():"]},
+        )
+
+    def test_split_diff_ignores_lines_before_first_header(self):
+        # Stray lines before any header should not create a section.
+        sections = ChangeDetectionAgent._split_diff(["+def orphan():"])
+
+        self.assertEqual(sections, {})
+
+
+@unittest.skipIf(shutil.which("git") is None, "git not installed")
+class TestDetectChanges(unittest.TestCase):
+    """Tests for ChangeDetectionAgent.detect_changes against a scratch repository."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.repo_root = Path(self._tmp.name)
+        (self.repo_root / "src").mkdir()
+        self._git("init", "-q")
+        (self.repo_root / "src" / "m.py").write_text("x = 1\n", encoding="utf-8")
+        self._commit("initial")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _git(self, *args):
+        subprocess.run(
+            ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+            cwd=self.repo_root,
+            check=True,
+            capture_output=True,
+        )
+
+    def _commit(self, message):
+        self._git("add", "-A")
+        self._git("commit", "-q", "-m", message)
+
+    def test_detect_changes_ignores_non_utf8_files_outside_src(self):
+        # Latin-1 files outside src/ should neither be diffed nor break detection.
+        (self.repo_root / "data.txt").write_bytes(b"caf\xe9\n")
+        (self.repo_root / "src" / "m.py").write_text(
+            "x = 1\n\n\ndef added():\n    return 1\n", encoding="utf-8"
+        )
+        self._commit("change")
+
+        result = ChangeDetectionAgent(self.repo_root).detect_changes()
+
+        self.assertEqual(result.changed_files, [self.repo_root / "src" / "m.py"])
+        self.assertEqual([symbol.name for symbol in result.changed_symbols], ["added"])
+
+    def test_load_diff_replaces_undecodable_bytes(self):
+        # Non-UTF-8 bytes in a src/ diff should be replaced rather than raise.
+        (self.repo_root / "src" / "m.py").write_bytes(b"x = 1\n# caf\xe9\ndef added():\n    return 1\n")
+        self._commit("change")
+
+        diff_by_file = ChangeDetectionAgent(self.repo_root)._load_diff()
+
+        self.assertEqual(list(diff_by_file), [Path("src/m.py")])
+        self.assertIn("+def added():", diff_by_file[Path("src/m.py")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from agents import test_discovery, test_generator
+from agents.coverage_analyzer import CoverageAnalysisResult, CoverageGap
+
+
+class TestEnsureModuleImport(unittest.TestCase):
+    """Tests for TestGenerationAgent._ensure_module_import."""
+
+    def setUp(self):
+        self.agent = test_generator.TestGenerationAgent(Path("."))
+
+    def test_inserts_after_last_import(self):
+        # New imports should follow the existing top-level import block.
+        content = "\"\"\"Doc.\"\"\"\n\nimport os\nfrom pathlib import Path\n\nVALUE = 1\n"
+
+        updated = self.agent._ensure_module_import(content, ["from src.m import f"])
+
+        self.assertEqual(
+            updated,
+            "\"\"\"Doc.\"\"\"\n\nimport os\nfrom pathlib import Path\nfrom src.m import f\n\nVALUE = 1\n",
+        )
+
+    def test_skips_imports_already_present(self):
+        # Lines that already exist should not be inserted twice.
+        content = "import os\nfrom src.m import f\n"
+        import_lines = ["from src.m import f", "import src.m as src_m_module"]
+
+        updated = self.agent._ensure_module_import(content, import_lines)
+
+        self.assertEqual(updated, "import os\nfrom src.m import f\nimport src.m as src_m_module\n")
+
+
+class TestGenerateTests(unittest.TestCase):
+    """Tests for TestGenerationAgent.generate_tests name handling."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.repo_root = Path(self._tmp.name)
+        (self.repo_root / "src").mkdir()
+        (self.repo_root / "tests").mkdir()
+        self.source_file = self.repo_root / "src" / "mod.py"
+        self.source_file.write_text(
+            "def clash(x: int) -> int:\n"
+            "    return x\n\n\n"
+            "def fresh(x: int) -> int:\n"
+            "    return x\n\n\n"
+            "def test_helper() -> int:\n"
+            "    return 1\n",
+            encoding="utf-8",
+        )
+        self.test_file = self.repo_root / "tests" / "test_mod.py"
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _generate(self):
+        gap = CoverageGap(file=self.source_file, missing_tests=["clash", "fresh", "test_helper"])
+        coverage = CoverageAnalysisResult(gaps=[gap], coverage_json_path=None)
+        discovery = test_discovery.TestDiscoveryAgent(self.repo_root).discover_tests()
+        test_generator.TestGenerationAgent(self.repo_root).generate_tests(coverage, discovery)
+        return self.test_file.read_text(encoding="utf-8")
+
+    def test_bound_and_test_prefixed_names_use_module_alias(self):
+        # Existing bindings must not be rebound, and test_* symbols must not be imported.
+        self.test_file.write_text(
+            "from mod import clash\n\n\ndef test_existing():\n    assert clash(1)\n",
+            encoding="utf-8",
+        )
+
+        content = self._generate()
+
+        self.assertIn(
+            "from mod import clash\nfrom src.mod import fresh\nimport src.mod as src_mod_module\n",
+            content,
+        )
+        self.assertIn("result = src_mod_module.clash(0)", content)
+        self.assertIn("result = fresh(0)", content)
+        self.assertIn("result = src_mod_module.test_helper()", content)
+        self.assertNotIn("import clash, ", content)
+
+    def test_new_file_imports_names_directly(self):
+        # Without existing bindings only test_* symbols need the alias.
+        content = self._generate()
+
+        self.assertIn("from src.mod import clash, fresh\nimport src.mod as src_mod_module\n", content)
+        self.assertIn("result = clash(0)", content)
+        self.assertIn("result = src_mod_module.test_helper()", content)
+
+
+if __name__ == "__main__":
+    unittest.main()